@@ -1,32 +1,123 @@
+import functools
+import json
+import os
 import sys
+from datetime import datetime, timedelta, timezone
 
 import boto3
+import botocore.session
+from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError, NoCredentialsError
 
+from catrole.boto_config import AWS_CONFIG
+
+_CACHE_DIR = os.path.expanduser("~/.catrole-cache")
+# Beyond botocore's 15-minute advisory refresh window, so a refresh never
+# gets back the same nearly-expired credentials from disk
+_REFRESH_WINDOW = timedelta(minutes=15)
+
+
+def _cache_path(account_id: str, role_name: str) -> str:
+    return os.path.join(_CACHE_DIR, f"{account_id}_{role_name}.json")
+
+
+def _load_cached_credentials(account_id: str, role_name: str) -> dict | None:
+    """Return cached STS credentials if present and not within the refresh window."""
+    try:
+        with open(_cache_path(account_id, role_name)) as f:
+            creds = json.load(f)
+        expiration = datetime.fromisoformat(creds["Expiration"])
+        if expiration - _REFRESH_WINDOW <= datetime.now(timezone.utc):
+            return None
+    except (OSError, ValueError, KeyError, TypeError):
+        # TypeError also covers a naive Expiration, which can't be compared to aware now()
+        return None
+    return creds
 
-def assume_role(account_id: str, role_name: str) -> boto3.Session:
-    """Assume the given role in the target account and return a session."""
-    role_arn = f"arn:aws:iam::{account_id}:role/{role_name}"
 
+def _save_cached_credentials(account_id: str, role_name: str, creds: dict) -> None:
+    """Persist STS credentials (mode 0600). Failures are ignored — the cache is best-effort."""
+    payload = {
+        "AccessKeyId": creds["AccessKeyId"],
+        "SecretAccessKey": creds["SecretAccessKey"],
+        "SessionToken": creds["SessionToken"],
+        "Expiration": creds["Expiration"].isoformat(),
+    }
     try:
-        sts = boto3.client("sts")
+        os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
+        fd = os.open(_cache_path(account_id, role_name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+    except OSError:
+        pass
+
+
+def _fetch_credentials(account_id: str, role_name: str) -> dict:
+    """Return credentials for the role, from the disk cache or a fresh AssumeRole.
+
+    STS errors propagate; assume_role turns them into a user-facing exit.
+    """
+    creds = _load_cached_credentials(account_id, role_name)
+    if creds is None:
+        sts = boto3.client("sts", config=AWS_CONFIG)
         response = sts.assume_role(
-            RoleArn=role_arn,
+            RoleArn=f"arn:aws:iam::{account_id}:role/{role_name}",
             RoleSessionName="catrole-session",
             DurationSeconds=3600,
         )
+        creds = response["Credentials"]
+        _save_cached_credentials(account_id, role_name, creds)
+        creds = {**creds, "Expiration": creds["Expiration"].isoformat()}
+    return {
+        "access_key": creds["AccessKeyId"],
+        "secret_key": creds["SecretAccessKey"],
+        "token": creds["SessionToken"],
+        "expiry_time": creds["Expiration"],
+    }
+
+
+@functools.lru_cache(maxsize=2048)
+def assume_role(account_id: str, role_name: str) -> boto3.Session:
+    """Assume the given role in the target account and return a session.
+
+    Credentials are cached under ~/.catrole-cache/ and reused across
+    invocations until they are within 15 minutes of expiry. Within a process
+    the session itself is cached per (account, role); its credentials refresh
+    automatically before they expire.
+    """
+    try:
+        metadata = _fetch_credentials(account_id, role_name)
     except NoCredentialsError:
         print("[error] No AWS credentials found. Configure your AWS credentials first.", file=sys.stderr)
         sys.exit(1)
     except ClientError as e:
         code = e.response["Error"]["Code"]
         msg = e.response["Error"]["Message"]
+        role_arn = f"arn:aws:iam::{account_id}:role/{role_name}"
         print(f"[error] Failed to assume role {role_arn}: {code} — {msg}", file=sys.stderr)
         sys.exit(1)
 
-    creds = response["Credentials"]
-    return boto3.Session(
-        aws_access_key_id=creds["AccessKeyId"],
-        aws_secret_access_key=creds["SecretAccessKey"],
-        aws_session_token=creds["SessionToken"],
+    credentials = RefreshableCredentials.create_from_metadata(
+        metadata=metadata,
+        refresh_using=functools.partial(_fetch_credentials, account_id, role_name),
+        method="sts-assume-role",
     )
+    botocore_session = botocore.session.get_session()
+    botocore_session._credentials = credentials
+    return boto3.Session(botocore_session=botocore_session)
+
+
+@functools.lru_cache(maxsize=4096)
+def get_client(session: boto3.Session, service: str):
+    """Return a client for the service, shared by every caller using this session.
+
+    boto3 clients are thread-safe, so reusing one keeps its connection pool
+    warm instead of building a new client (and pool) per role or account.
+    """
+    return session.client(service, config=AWS_CONFIG)
+
+
+def clear_session_cache() -> None:
+    """Forget the in-process sessions and clients (the disk cache is untouched)."""
+    get_client.cache_clear()
+    assume_role.cache_clear()
@@ -0,0 +1,12 @@
+from botocore.config import Config
+
+from catrole import __version__
+
+# Shared client config: the connection pool is sized above the scanner's thread
+# fan-out, and adaptive retries back off on IAM/STS throttling instead of failing.
+AWS_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+    user_agent_extra=f"catrole/{__version__}",
+)
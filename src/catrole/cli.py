@@ -2,20 +2,7 @@ import argparse
 import os
 import sys
 
-from rich.console import Console
-
 from catrole import __version__
-from catrole.auth import assume_role
-from catrole.formatter import (
-    print_table, save_csv, print_search_results, save_search_csv,
-    print_action_search_results, save_action_search_csv,
-    print_user_details, save_user_csv,
-    print_group_details, save_group_csv,
-    print_permission_set_details, save_permission_set_csv,
-)
-from catrole.idc_scanner import scan_permission_set
-from catrole.scanner import scan_policy, scan_role, scan_user, scan_group
-from catrole.search import search_all_accounts, find_action_all_accounts
 from catrole.utils import parse_arn, validate_account
 
 
@@ -39,6 +26,12 @@ def build_parser() -> argparse.ArgumentParser:
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument("-v", "--version", action="version", version=f"catrole {__version__}")
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="Load boto3 service models and output modules once, then exit, "
+             "so later runs start from a warm OS page cache (no AWS calls made)",
+    )
 
     # Cross-account assume role
     parser.add_argument(
@@ -65,9 +58,26 @@ def build_parser() -> argparse.ArgumentParser:
     search_group.add_argument(
         "-s", "--search",
         metavar="PATTERN",
-        help="Wildcard pattern to search roles/policies (e.g. '*lambda*', 'admin-*'). "
+        help="Wildcard pattern to search roles/policies (e.g. '*lambda*', 'admin-*'); start with '/' "
+             "to match on path + name (e.g. '/service-role/*'). "
              "Searches all org accounts, or combine with -a to search a single account",
     )
+    search_group.add_argument(
+        "--only-attached",
+        action="store_true",
+        help="With -s, skip customer-managed policies that are not attached to any user, group or role",
+    )
+    search_scope = search_group.add_mutually_exclusive_group()
+    search_scope.add_argument(
+        "--roles-only",
+        action="store_true",
+        help="With -s, search role names only (skips all policy listing calls)",
+    )
+    search_scope.add_argument(
+        "--policies-only",
+        action="store_true",
+        help="With -s, search customer-managed policy names only (skips all role listing calls)",
+    )
 
     # Mode 4: action search
     action_group = parser.add_argument_group("action search mode")
@@ -78,6 +88,16 @@ def build_parser() -> argparse.ArgumentParser:
              "Searches all org accounts, or combine with -a to search a single account",
     )
 
+    search_tuning = parser.add_argument_group("search/action search tuning")
+    search_tuning.add_argument(
+        "--workers",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of accounts searched concurrently with -s/-f (default: 10). "
+             "The work is network-bound, so large orgs benefit from raising this",
+    )
+
     # Mode 5: IAM user scan
     user_group = parser.add_argument_group("user mode")
     user_group.add_argument(
@@ -114,9 +134,24 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def main() -> None:
+    # Answer a bare --version without constructing the argument parser
+    if sys.argv[1:] in (["-v"], ["--version"]):
+        print(f"catrole {__version__}")
+        return
+
     parser = build_parser()
     args = parser.parse_args()
 
+    if args.warmup:
+        from catrole.warmup import warmup
+
+        services = warmup()
+        print(f"catrole warmed up: {', '.join(services)}")
+        return
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
     assume_role_name = args.assume_role
     if not assume_role_name:
         catrole_file = os.path.expanduser("~/.catrole")
@@ -128,6 +163,8 @@ def main() -> None:
                 "-R/--assume-role is required (or set a default role in ~/.catrole)"
             )
 
+    # Heavy imports (boto3, rich, per-mode modules) are deferred into each mode,
+    # after its argument checks, so --help, --version and argument errors never load them
     # --- Mode 5: IAM User scan ---
     if args.user:
         if any([args.search, args.find_action, args.role, args.policy, args.arn, args.group, args.permission_set]):
@@ -135,6 +172,11 @@ def main() -> None:
         if not args.account:
             parser.error("-u/--user requires -a/--account")
         account = validate_account(args.account)
+
+        from catrole.formatter import print_user_details, save_user_csv
+        from catrole.auth import assume_role
+        from catrole.scanner import scan_user
+
         session = assume_role(account, assume_role_name)
         data = scan_user(session, args.user)
         print_user_details(data, account)
@@ -150,6 +192,11 @@ def main() -> None:
         if not args.account:
             parser.error("-g/--group requires -a/--account")
         account = validate_account(args.account)
+
+        from catrole.formatter import print_group_details, save_group_csv
+        from catrole.auth import assume_role
+        from catrole.scanner import scan_group
+
         session = assume_role(account, assume_role_name)
         data = scan_group(session, args.group)
         print_group_details(data, account)
@@ -165,6 +212,11 @@ def main() -> None:
         if not args.account:
             parser.error("-P/--permission-set requires -a/--account (your IDC management or delegated-admin account)")
         account = validate_account(args.account)
+
+        from catrole.formatter import print_permission_set_details, save_permission_set_csv
+        from catrole.auth import assume_role
+        from catrole.idc_scanner import scan_permission_set
+
         session = assume_role(account, assume_role_name)
         data = scan_permission_set(session, args.permission_set, region=args.region)
         print_permission_set_details(data, account)
@@ -178,8 +230,11 @@ def main() -> None:
         if args.search or args.role or args.policy or args.arn:
             parser.error("-f/--find-action cannot be combined with -s, -r, -p, or -A")
 
+        from catrole.formatter import get_console, print_action_search_results, save_action_search_csv
+        from catrole.search import find_action_all_accounts, resolve_account_name
+
         action_pattern = args.find_action
-        console = Console()
+        console = get_console()
 
         account_id = None
         if args.account:
@@ -190,13 +245,21 @@ def main() -> None:
         console.print(f"[bold cyan]Assuming role:[/bold cyan] [yellow]{assume_role_name}[/yellow]\n")
 
         def _action_progress(name, idx, total):
-            console.print(f"  [{idx}/{total}] Scanning [bold]{name}[/bold] …", highlight=False)
+            # total is None while the org's accounts are still being listed
+            console.print(f"  [{idx}/{total or '?'}] Scanning [bold]{name}[/bold] …", highlight=False)
 
         results = find_action_all_accounts(
             action_pattern, role_name=assume_role_name,
             account_id=account_id, progress_callback=_action_progress,
+            max_workers=args.workers,
         )
 
+        # Single account: only look up its display name if there is something to show
+        if account_id and results:
+            account_name = resolve_account_name(account_id)
+            for r in results:
+                r["AccountName"] = account_name
+
         for r in results:
             if r.get("error"):
                 console.print(f"  [dim red]⚠ {r['AccountName']} ({r['AccountId']}): {r['error']}[/dim red]")
@@ -213,8 +276,13 @@ def main() -> None:
         if args.role or args.policy or args.arn:
             parser.error("-s/--search cannot be combined with -r, -p, or -A")
 
+        from catrole.formatter import (
+            get_console, flatten_search_results, print_search_results, save_search_csv,
+        )
+        from catrole.search import iter_search_all_accounts, resolve_account_name
+
         pattern = args.search
-        console = Console()
+        console = get_console()
 
         account_id = None
         if args.account:
@@ -225,18 +293,32 @@ def main() -> None:
         console.print(f"[bold cyan]Assuming role:[/bold cyan] [yellow]{assume_role_name}[/yellow]\n")
 
         def _progress(name, idx, total):
-            console.print(f"  [{idx}/{total}] Scanning [bold]{name}[/bold] …", highlight=False)
-
-        results = search_all_accounts(pattern, role_name=assume_role_name, account_id=account_id, progress_callback=_progress)
-
-        # Show errors for accounts that had partial failures
-        for r in results:
+            # total is None while the org's accounts are still being listed
+            console.print(f"  [{idx}/{total or '?'}] Scanning [bold]{name}[/bold] …", highlight=False)
+
+        results = []
+        for r in iter_search_all_accounts(
+            pattern, role_name=assume_role_name, account_id=account_id,
+            progress_callback=_progress, max_workers=args.workers,
+            only_attached=args.only_attached,
+            search_roles=not args.policies_only, search_policies=not args.roles_only,
+        ):
+            # Show partial failures as soon as the account finishes
             if r.get("error"):
                 console.print(f"  [dim red]⚠ {r['AccountName']} ({r['AccountId']}): {r['error']}[/dim red]")
+            results.append(r)
+        results.sort(key=lambda r: r["AccountName"])
+
+        # Single account: only look up its display name if there is something to show
+        if account_id and results:
+            account_name = resolve_account_name(account_id)
+            for r in results:
+                r["AccountName"] = account_name
 
-        print_search_results(results, pattern)
+        role_rows, policy_rows = flatten_search_results(results)
+        print_search_results(role_rows, policy_rows, pattern)
 
-        csv_path = save_search_csv(results, pattern)
+        csv_path = save_search_csv(role_rows, policy_rows, pattern)
         if csv_path:
             console.print(f"CSV saved to: {csv_path}")
         return
@@ -263,6 +345,10 @@ def main() -> None:
         parser.print_help()
         sys.exit(1)
 
+    from catrole.formatter import print_table, save_csv
+    from catrole.auth import assume_role
+    from catrole.scanner import scan_policy, scan_role
+
     # Authenticate
     session = assume_role(account, assume_role_name)
 
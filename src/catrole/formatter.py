@@ -2,13 +2,68 @@ import csv
 import json
 import os
 from datetime import datetime
+from operator import attrgetter
 
 from rich.console import Console
 from rich.table import Table
 from rich.text import Text
 
+from catrole.models import PermissionRow
 from catrole.utils import generate_filename
 
+_console: Console | None = None
+
+# CSV columns for PermissionRow, and a getter returning them as a tuple
+_PERMISSION_FIELDS = ("PolicyName", "PolicyType", "Sid", "Effect", "Action", "Resource", "Condition")
+_permission_values = attrgetter(*_PERMISSION_FIELDS)
+
+# Table schemas: one dict of Table.add_column kwargs per column
+_PERMISSION_COLUMNS = (
+    {"header": "#", "style": "dim", "width": 5, "justify": "right"},
+    {"header": "Policy Name", "style": "bold white", "max_width": 30},
+    {"header": "Type", "style": "magenta", "max_width": 18},
+    {"header": "Sid", "style": "white", "max_width": 30},
+    {"header": "Effect", "max_width": 8},
+    {"header": "Action", "style": "cyan", "max_width": 40},
+    {"header": "Resource", "style": "green", "max_width": 50},
+    {"header": "Condition", "style": "yellow", "max_width": 40},
+)
+
+_SEARCH_ROLE_COLUMNS = (
+    {"header": "#", "style": "dim", "width": 5, "justify": "right"},
+    {"header": "Account Name", "style": "bold white", "max_width": 30},
+    {"header": "Account ID", "style": "magenta", "max_width": 14},
+    {"header": "Role Name", "style": "cyan", "max_width": 40},
+    {"header": "Attached Policies", "style": "green"},
+)
+
+_SEARCH_POLICY_COLUMNS = (
+    {"header": "#", "style": "dim", "width": 5, "justify": "right"},
+    {"header": "Account Name", "style": "bold white", "max_width": 30},
+    {"header": "Account ID", "style": "magenta", "max_width": 14},
+    {"header": "Policy ARN", "style": "cyan"},
+)
+
+_ACTION_SEARCH_COLUMNS = (
+    {"header": "#", "style": "dim", "width": 5, "justify": "right"},
+    {"header": "Account", "style": "bold white", "max_width": 25},
+    {"header": "Account ID", "style": "magenta", "max_width": 14},
+    {"header": "Role", "style": "cyan", "max_width": 30},
+    {"header": "Policy", "style": "bold white", "max_width": 25},
+    {"header": "Effect", "max_width": 8},
+    {"header": "Action", "style": "cyan", "max_width": 40},
+    {"header": "Resource", "style": "green", "max_width": 45},
+    {"header": "Condition", "style": "yellow", "max_width": 35},
+)
+
+
+def get_console() -> Console:
+    """Return the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        _console = Console()
+    return _console
+
 
 def _fmt_date(dt) -> str:
     """Format a datetime object or 'Never' string for display."""
@@ -19,116 +74,97 @@ def _fmt_date(dt) -> str:
     return dt.strftime("%Y-%m-%d %H:%M UTC")
 
 
-def _permission_table(title: str, rows: list[dict]) -> Table:
+def _add_columns(table: Table, columns: tuple[dict, ...]) -> Table:
+    """Add every column of a schema to a Rich Table."""
+    for column in columns:
+        table.add_column(**column)
+    return table
+
+
+def _permission_table(title: str, rows: list[PermissionRow]) -> Table:
     """Build a Rich Table of flattened permission rows."""
     table = Table(title=title, title_style="bold cyan", expand=True, show_lines=False)
-    table.add_column("#", style="dim", width=5, justify="right")
-    table.add_column("Policy Name", style="bold white", max_width=30)
-    table.add_column("Type", style="magenta", max_width=18)
-    table.add_column("Sid", style="white", max_width=30)
-    table.add_column("Effect", max_width=8)
-    table.add_column("Action", style="cyan", max_width=40)
-    table.add_column("Resource", style="green", max_width=50)
-    table.add_column("Condition", style="yellow", max_width=40)
+    _add_columns(table, _PERMISSION_COLUMNS)
 
     if not rows:
         table.add_row("", "[dim]None[/dim]", "", "", "", "", "", "")
     else:
         for idx, row in enumerate(rows, 1):
-            effect_style = "bold green" if row["Effect"] == "Allow" else "bold red"
+            effect_style = "bold green" if row.Effect == "Allow" else "bold red"
             table.add_row(
                 str(idx),
-                row["PolicyName"],
-                row["PolicyType"],
-                row.get("Sid", "-"),
-                Text(row["Effect"], style=effect_style),
-                row["Action"],
-                row["Resource"],
-                row["Condition"] if row["Condition"] != "-" else "-",
+                row.PolicyName,
+                row.PolicyType,
+                row.Sid,
+                Text(row.Effect, style=effect_style),
+                row.Action,
+                row.Resource,
+                row.Condition,
             )
     return table
 
 
-def print_table(rows: list[dict], entity_type: str, entity_name: str, account: str) -> None:
+def print_table(rows: list[PermissionRow], entity_type: str, entity_name: str, account: str) -> None:
     """Print a rich table of IAM permissions to the terminal."""
-    console = Console()
+    console = get_console()
 
     if not rows:
         console.print(f"\n[yellow]No permissions found for {entity_type} '{entity_name}' in account {account}.[/yellow]\n")
         return
 
     title = f"IAM Permissions for {entity_type} \"{entity_name}\" in account {account}"
-    table = Table(title=title, show_lines=False, expand=True, title_style="bold cyan")
-
-    table.add_column("#", style="dim", width=5, justify="right")
-    table.add_column("Policy Name", style="bold white", max_width=30)
-    table.add_column("Type", style="magenta", max_width=18)
-    table.add_column("Sid", style="white", max_width=30)
-    table.add_column("Effect", max_width=8)
-    table.add_column("Action", style="cyan", max_width=40)
-    table.add_column("Resource", style="green", max_width=50)
-    table.add_column("Condition", style="yellow", max_width=40)
-
-    for idx, row in enumerate(rows, 1):
-        effect_style = "bold green" if row["Effect"] == "Allow" else "bold red"
-        effect_text = Text(row["Effect"], style=effect_style)
-
-        condition_display = row["Condition"] if row["Condition"] != "-" else "-"
-
-        table.add_row(
-            str(idx),
-            row["PolicyName"],
-            row["PolicyType"],
-            row.get("Sid", "-"),
-            effect_text,
-            row["Action"],
-            row["Resource"],
-            condition_display,
-        )
 
     console.print()
-    console.print(table)
+    console.print(_permission_table(title, rows))
     console.print(f"\n[bold]{len(rows)}[/bold] permission entries found.\n")
 
 
-def save_csv(rows: list[dict], entity_type: str, account: str, name: str) -> str:
+def save_csv(rows: list[PermissionRow], entity_type: str, account: str, name: str) -> str:
     """Save permission rows to a CSV file. Returns the filename."""
     filename = generate_filename(entity_type, account, name)
     filepath = os.path.join(os.getcwd(), filename)
 
-    fieldnames = ["PolicyName", "PolicyType", "Sid", "Effect", "Action", "Resource", "Condition"]
-
     with open(filepath, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+        writer = csv.writer(f)
+        writer.writerow(_PERMISSION_FIELDS)
+        writer.writerows(_permission_values(row) for row in rows)
 
     return filepath
 
 
-def print_search_results(results: list[dict], pattern: str) -> None:
-    """Print org-wide search results as rich tables (roles table + policies table)."""
-    console = Console()
+def flatten_search_results(results: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Flatten org-wide search results into (role_rows, policy_rows) in a single pass.
 
-    # Collect role rows and policy rows
+    Each role row carries its attached policies pre-joined as one string
+    ("" when none), shared by the table and CSV renderers.
+    """
     role_rows = []
     policy_rows = []
 
     for r in results:
+        account_name = r["AccountName"]
+        account_id = r["AccountId"]
         for role in r["roles"]:
             role_rows.append({
-                "AccountName": r["AccountName"],
-                "AccountId": r["AccountId"],
-                "RoleName": role["RoleName"],
-                "AttachedPolicies": ", ".join(role["AttachedPolicies"]) if role["AttachedPolicies"] else "-",
+                "AccountName": account_name,
+                "AccountId": account_id,
+                "RoleName": role.name,
+                "AttachedPolicies": ", ".join(role.policies),
             })
         for pol in r["policies"]:
             policy_rows.append({
-                "AccountName": r["AccountName"],
-                "AccountId": r["AccountId"],
+                "AccountName": account_name,
+                "AccountId": account_id,
                 "PolicyArn": pol["PolicyArn"],
             })
 
+    return role_rows, policy_rows
+
+
+def print_search_results(role_rows: list[dict], policy_rows: list[dict], pattern: str) -> None:
+    """Print flattened search results as rich tables (roles table + policies table)."""
+    console = get_console()
+
     if not role_rows and not policy_rows:
         console.print(f"\n[yellow]No roles or policies matching '{pattern}' found across the organization.[/yellow]\n")
         return
@@ -140,14 +176,10 @@ def print_search_results(results: list[dict], pattern: str) -> None:
             expand=True,
             title_style="bold cyan",
         )
-        table.add_column("#", style="dim", width=5, justify="right")
-        table.add_column("Account Name", style="bold white", max_width=30)
-        table.add_column("Account ID", style="magenta", max_width=14)
-        table.add_column("Role Name", style="cyan", max_width=40)
-        table.add_column("Attached Policies", style="green")
+        _add_columns(table, _SEARCH_ROLE_COLUMNS)
 
         for idx, row in enumerate(role_rows, 1):
-            table.add_row(str(idx), row["AccountName"], row["AccountId"], row["RoleName"], row["AttachedPolicies"])
+            table.add_row(str(idx), row["AccountName"], row["AccountId"], row["RoleName"], row["AttachedPolicies"] or "-")
 
         console.print()
         console.print(table)
@@ -160,10 +192,7 @@ def print_search_results(results: list[dict], pattern: str) -> None:
             expand=True,
             title_style="bold cyan",
         )
-        table.add_column("#", style="dim", width=5, justify="right")
-        table.add_column("Account Name", style="bold white", max_width=30)
-        table.add_column("Account ID", style="magenta", max_width=14)
-        table.add_column("Policy ARN", style="cyan")
+        _add_columns(table, _SEARCH_POLICY_COLUMNS)
 
         for idx, row in enumerate(policy_rows, 1):
             table.add_row(str(idx), row["AccountName"], row["AccountId"], row["PolicyArn"])
@@ -173,31 +202,9 @@ def print_search_results(results: list[dict], pattern: str) -> None:
         console.print(f"\n[bold]{len(policy_rows)}[/bold] matching policy/policies found.\n")
 
 
-def save_search_csv(results: list[dict], pattern: str) -> str | None:
-    """Save org-wide search results to a CSV. Returns filepath or None if no results."""
-    role_rows = []
-    policy_rows = []
-
-    for r in results:
-        for role in r["roles"]:
-            role_rows.append({
-                "AccountName": r["AccountName"],
-                "AccountId": r["AccountId"],
-                "Type": "Role",
-                "Name": role["RoleName"],
-                "AttachedPolicies": ", ".join(role["AttachedPolicies"]) if role["AttachedPolicies"] else "",
-            })
-        for pol in r["policies"]:
-            policy_rows.append({
-                "AccountName": r["AccountName"],
-                "AccountId": r["AccountId"],
-                "Type": "Policy",
-                "Name": pol["PolicyArn"],
-                "AttachedPolicies": "",
-            })
-
-    all_rows = role_rows + policy_rows
-    if not all_rows:
+def save_search_csv(role_rows: list[dict], policy_rows: list[dict], pattern: str) -> str | None:
+    """Save flattened search results to a CSV. Returns filepath or None if no results."""
+    if not role_rows and not policy_rows:
         return None
 
     safe_pattern = pattern.replace("*", "STAR").replace("?", "Q").replace("/", "_")
@@ -208,27 +215,30 @@ def save_search_csv(results: list[dict], pattern: str) -> str | None:
     fieldnames = ["AccountName", "AccountId", "Type", "Name", "AttachedPolicies"]
 
     with open(filepath, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_rows)
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            (row["AccountName"], row["AccountId"], "Role", row["RoleName"], row["AttachedPolicies"])
+            for row in role_rows
+        )
+        writer.writerows(
+            (row["AccountName"], row["AccountId"], "Policy", row["PolicyArn"], "")
+            for row in policy_rows
+        )
 
     return filepath
 
 
 def print_action_search_results(results: list[dict], pattern: str) -> None:
     """Print action search results as a single rich table."""
-    console = Console()
+    console = get_console()
 
-    flat_rows = []
-    for r in results:
-        for match in r["matches"]:
-            for row in match["rows"]:
-                flat_rows.append({
-                    "AccountName": r["AccountName"],
-                    "AccountId": r["AccountId"],
-                    "RoleName": match["RoleName"],
-                    **row,
-                })
+    flat_rows = [
+        (r, match["RoleName"], row)
+        for r in results
+        for match in r["matches"]
+        for row in match["rows"]
+    ]
 
     if not flat_rows:
         console.print(f"\n[yellow]No roles with action matching '{pattern}' found.[/yellow]\n")
@@ -239,31 +249,22 @@ def print_action_search_results(results: list[dict], pattern: str) -> None:
         expand=True,
         title_style="bold cyan",
     )
-    table.add_column("#", style="dim", width=5, justify="right")
-    table.add_column("Account", style="bold white", max_width=25)
-    table.add_column("Account ID", style="magenta", max_width=14)
-    table.add_column("Role", style="cyan", max_width=30)
-    table.add_column("Policy", style="bold white", max_width=25)
-    table.add_column("Effect", max_width=8)
-    table.add_column("Action", style="cyan", max_width=40)
-    table.add_column("Resource", style="green", max_width=45)
-    table.add_column("Condition", style="yellow", max_width=35)
-
-    for idx, row in enumerate(flat_rows, 1):
-        effect_style = "bold green" if row["Effect"] == "Allow" else "bold red"
-        effect_text = Text(row["Effect"], style=effect_style)
-        condition_display = row["Condition"] if row["Condition"] != "-" else "-"
+    _add_columns(table, _ACTION_SEARCH_COLUMNS)
+
+    for idx, (r, role_name, row) in enumerate(flat_rows, 1):
+        effect_style = "bold green" if row.Effect == "Allow" else "bold red"
+        effect_text = Text(row.Effect, style=effect_style)
 
         table.add_row(
             str(idx),
-            row["AccountName"],
-            row["AccountId"],
-            row["RoleName"],
-            row["PolicyName"],
+            r["AccountName"],
+            r["AccountId"],
+            role_name,
+            row.PolicyName,
             effect_text,
-            row["Action"],
-            row["Resource"],
-            condition_display,
+            row.Action,
+            row.Resource,
+            row.Condition,
         )
 
     console.print()
@@ -280,23 +281,7 @@ def print_action_search_results(results: list[dict], pattern: str) -> None:
 
 def save_action_search_csv(results: list[dict], pattern: str) -> str | None:
     """Save action search results to CSV. Returns filepath or None if no results."""
-    flat_rows = []
-    for r in results:
-        for match in r["matches"]:
-            for row in match["rows"]:
-                flat_rows.append({
-                    "AccountName": r["AccountName"],
-                    "AccountId": r["AccountId"],
-                    "RoleName": match["RoleName"],
-                    "PolicyName": row["PolicyName"],
-                    "PolicyType": row["PolicyType"],
-                    "Effect": row["Effect"],
-                    "Action": row["Action"],
-                    "Resource": row["Resource"],
-                    "Condition": row["Condition"],
-                })
-
-    if not flat_rows:
+    if not any(match["rows"] for r in results for match in r["matches"]):
         return None
 
     safe_pattern = pattern.replace("*", "STAR").replace("?", "Q").replace("/", "_").replace(":", "-")
@@ -308,9 +293,15 @@ def save_action_search_csv(results: list[dict], pattern: str) -> str | None:
                   "Effect", "Action", "Resource", "Condition"]
 
     with open(filepath, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(flat_rows)
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            (r["AccountName"], r["AccountId"], match["RoleName"],
+             row.PolicyName, row.PolicyType, row.Effect, row.Action, row.Resource, row.Condition)
+            for r in results
+            for match in r["matches"]
+            for row in match["rows"]
+        )
 
     return filepath
 
@@ -321,7 +312,7 @@ def save_action_search_csv(results: list[dict], pattern: str) -> str | None:
 
 def print_user_details(data: dict, account: str) -> None:
     """Print all details for an IAM user."""
-    console = Console()
+    console = get_console()
     user = data["user"]
     user_name = user["UserName"]
 
@@ -410,25 +401,20 @@ def print_user_details(data: dict, account: str) -> None:
 
 def save_user_csv(data: dict, account: str, user_name: str) -> str | None:
     """Save user permissions (direct + group-inherited) to CSV. Returns filepath or None."""
-    all_rows = []
-    for row in data["direct_policies"]:
-        all_rows.append({"Source": "Direct", **row})
+    all_rows = [("Direct", *_permission_values(row)) for row in data["direct_policies"]]
     for grp_name, rows in data["group_policies"].items():
-        for row in rows:
-            all_rows.append({"Source": f"Group:{grp_name}", **row})
+        source = f"Group:{grp_name}"
+        all_rows.extend((source, *_permission_values(row)) for row in rows)
 
     if not all_rows:
         return None
 
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    safe_name = user_name.replace("/", "_")
-    filename = f"iam-user_{account}_{safe_name}_{timestamp}.csv"
+    filename = generate_filename("user", account, user_name)
     filepath = os.path.join(os.getcwd(), filename)
 
-    fieldnames = ["Source", "PolicyName", "PolicyType", "Sid", "Effect", "Action", "Resource", "Condition"]
     with open(filepath, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(("Source", *_PERMISSION_FIELDS))
         writer.writerows(all_rows)
 
     return filepath
@@ -440,7 +426,7 @@ def save_user_csv(data: dict, account: str, user_name: str) -> str | None:
 
 def print_group_details(data: dict, account: str) -> None:
     """Print all details for an IAM group."""
-    console = Console()
+    console = get_console()
     group = data["group"]
     group_name = group["GroupName"]
 
@@ -487,16 +473,13 @@ def save_group_csv(data: dict, account: str, group_name: str) -> str | None:
     if not rows:
         return None
 
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    safe_name = group_name.replace("/", "_")
-    filename = f"iam-group_{account}_{safe_name}_{timestamp}.csv"
+    filename = generate_filename("group", account, group_name)
     filepath = os.path.join(os.getcwd(), filename)
 
-    fieldnames = ["PolicyName", "PolicyType", "Sid", "Effect", "Action", "Resource", "Condition"]
     with open(filepath, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+        writer = csv.writer(f)
+        writer.writerow(_PERMISSION_FIELDS)
+        writer.writerows(_permission_values(row) for row in rows)
 
     return filepath
 
@@ -507,7 +490,7 @@ def save_group_csv(data: dict, account: str, group_name: str) -> str | None:
 
 def print_permission_set_details(data: dict, account: str) -> None:
     """Print all details for an AWS Identity Center permission set."""
-    console = Console()
+    console = get_console()
     ps = data["permission_set"]
     ps_name = ps["Name"]
 
@@ -3,6 +3,8 @@ import sys
 import boto3
 from botocore.exceptions import ClientError
 
+from catrole.boto_config import AWS_CONFIG
+
 
 def _find_permission_set_arn(sso_admin, instance_arn: str, name: str) -> str | None:
     """Iterate all permission sets in the instance and return the ARN matching name."""
@@ -38,7 +40,7 @@ def scan_permission_set(session: boto3.Session, permission_set_name: str, region
         }
     """
     client_kwargs = {"region_name": region} if region else {}
-    sso_admin = session.client("sso-admin", **client_kwargs)
+    sso_admin = session.client("sso-admin", config=AWS_CONFIG, **client_kwargs)
 
     # Discover the SSO instance
     try:
@@ -124,7 +126,7 @@ def scan_permission_set(session: boto3.Session, permission_set_name: str, region
 
     # Assignments: for each provisioned account, list principals and resolve names
     assignments = []
-    identitystore = session.client("identitystore", **client_kwargs)
+    identitystore = session.client("identitystore", config=AWS_CONFIG, **client_kwargs)
     for account_id in provisioned_accounts:
         try:
             paginator = sso_admin.get_paginator("list_account_assignments")
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import NamedTuple
+
+
+@dataclass(slots=True, frozen=True)
+class PermissionRow:
+    """A single action/resource entry flattened out of a policy statement.
+
+    Field names match the CSV column headers.
+    """
+
+    PolicyName: str
+    PolicyType: str
+    Sid: str
+    Effect: str
+    Action: str
+    Resource: str
+    Condition: str
+
+
+class RoleMatch(NamedTuple):
+    """A role matched by a name search, with the names of its attached managed policies."""
+
+    name: str
+    policies: tuple[str, ...]
@@ -1,29 +1,61 @@
 import fnmatch
+import functools
 import json
+import re
 import sys
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from botocore.exceptions import ClientError
 
+from catrole.auth import get_client
+from catrole.models import PermissionRow
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install catrole[fast]
+    orjson = None
+
+# Per-role fan-out for policy fetches; each is an independent IAM round-trip.
+_POLICY_WORKERS = 16
+
+# IAM list APIs accept up to 1000 items per page (the service default is 100)
+_PAGE_SIZE = 1000
+_PAGE_CONFIG = {"PageSize": _PAGE_SIZE}
+
+_NOT_ACTION_PREFIX = "NotAction: "
+_NOT_RESOURCE_PREFIX = "NotResource: "
+
+
+def _json_loads(s: str):
+    """Parse JSON with orjson when installed, else the stdlib."""
+    return orjson.loads(s) if orjson else json.loads(s)
+
 
 def _decode_policy_document(document: str | dict) -> dict:
     """Decode a policy document — handles both URL-encoded strings and dicts."""
     if isinstance(document, str):
-        return json.loads(urllib.parse.unquote(document))
+        if "%" in document:
+            document = urllib.parse.unquote(document)
+        return _json_loads(document)
     return document
 
 
-def _flatten_statements(policy_name: str, policy_type: str, document: dict) -> list[dict]:
+def _flatten_statements(policy_name: str, policy_type: str, document: dict) -> list[PermissionRow]:
     """Flatten a policy document's statements into individual action/resource rows."""
     rows = []
     statements = document.get("Statement", [])
     if isinstance(statements, dict):
         statements = [statements]
 
+    # Low-cardinality fields are interned so rows share one string object
+    policy_type = sys.intern(policy_type)
+
     for stmt in statements:
-        sid = stmt.get("Sid", "-")
-        effect = stmt.get("Effect", "")
+        sid = sys.intern(stmt.get("Sid", "-"))
+        effect = sys.intern(stmt.get("Effect", ""))
         actions = stmt.get("Action", stmt.get("NotAction", []))
         resources = stmt.get("Resource", stmt.get("NotResource", []))
         condition = stmt.get("Condition", None)
@@ -33,54 +65,89 @@ def _flatten_statements(policy_name: str, policy_type: str, document: dict) -> l
         if isinstance(resources, str):
             resources = [resources]
 
-        is_not_action = "NotAction" in stmt
-        is_not_resource = "NotResource" in stmt
+        # Apply the NotAction/NotResource prefixes once per value, not per row
+        if "NotAction" in stmt:
+            actions = [_NOT_ACTION_PREFIX + action for action in actions]
+        if "NotResource" in stmt:
+            resources = [_NOT_RESOURCE_PREFIX + resource for resource in resources]
 
+        # Always the stdlib: orjson does not escape non-ASCII, so output would depend on the extra
         condition_str = json.dumps(condition, separators=(",", ":")) if condition else "-"
 
         for action in actions:
             for resource in resources:
-                rows.append({
-                    "PolicyName": policy_name,
-                    "PolicyType": policy_type,
-                    "Sid": sid,
-                    "Effect": effect,
-                    "Action": f"NotAction: {action}" if is_not_action else action,
-                    "Resource": f"NotResource: {resource}" if is_not_resource else resource,
-                    "Condition": condition_str,
-                })
+                rows.append(PermissionRow(policy_name, policy_type, sid, effect, action, resource, condition_str))
     return rows
 
 
-def _get_policy_statements(iam, policy_arn: str, policy_name: str, policy_type: str) -> list[dict]:
-    """Fetch and flatten statements from a managed policy."""
+def _get_policy_statements(iam, policy_arn: str, policy_name: str, policy_type: str,
+                           policy_cache: dict | None = None) -> list[PermissionRow]:
+    """Fetch and flatten statements from a managed policy.
+
+    If policy_cache is given, rows are looked up in and stored to it by policy ARN.
+    Cached lists are shared between callers and must not be mutated.
+    """
+    if policy_cache is not None and policy_arn in policy_cache:
+        return policy_cache[policy_arn]
+
     policy = iam.get_policy(PolicyArn=policy_arn)
     version_id = policy["Policy"]["DefaultVersionId"]
     version = iam.get_policy_version(PolicyArn=policy_arn, VersionId=version_id)
     document = _decode_policy_document(version["PolicyVersion"]["Document"])
-    return _flatten_statements(policy_name, policy_type, document)
+    rows = _flatten_statements(policy_name, policy_type, document)
 
+    if policy_cache is not None:
+        policy_cache[policy_arn] = rows
+    return rows
 
-def scan_role(session: boto3.Session, role_name: str) -> list[dict]:
-    """Scan all policies attached to a role and return flattened permission rows."""
-    iam = session.client("iam")
+
+def _get_role_inline_statements(iam, role_name: str, policy_name: str) -> list[PermissionRow]:
+    """Fetch and flatten statements from a role's inline policy."""
+    response = iam.get_role_policy(RoleName=role_name, PolicyName=policy_name)
+    document = _decode_policy_document(response["PolicyDocument"])
+    return _flatten_statements(policy_name, "Inline", document)
+
+
+def _list_role_policies(iam, role_name: str) -> tuple[list[tuple[str, str, str]], list[str]]:
+    """List a role's attached managed policies as (arn, name, type) and its inline policy names."""
+    attached = []
+    paginator = iam.get_paginator("list_attached_role_policies")
+    for page in paginator.paginate(RoleName=role_name, PaginationConfig=_PAGE_CONFIG):
+        for pol in page["AttachedPolicies"]:
+            policy_type = "AWS Managed" if pol["PolicyArn"].startswith("arn:aws:iam::aws:") else "Customer Managed"
+            attached.append((pol["PolicyArn"], pol["PolicyName"], policy_type))
+
+    inline = []
+    paginator = iam.get_paginator("list_role_policies")
+    for page in paginator.paginate(RoleName=role_name, PaginationConfig=_PAGE_CONFIG):
+        inline.extend(page["PolicyNames"])
+
+    return attached, inline
+
+
+def scan_role(session: boto3.Session, role_name: str, policy_cache: dict | None = None) -> list[PermissionRow]:
+    """Scan all policies attached to a role and return flattened permission rows.
+
+    Args:
+        session: Authenticated boto3 session.
+        role_name: IAM role to scan.
+        policy_cache: Optional dict keyed by policy ARN → list[PermissionRow],
+                      shared across scans to avoid re-fetching the same managed policy.
+    """
+    iam = get_client(session, "iam")
     rows = []
 
     try:
-        # Attached managed policies (paginated)
-        paginator = iam.get_paginator("list_attached_role_policies")
-        for page in paginator.paginate(RoleName=role_name):
-            for pol in page["AttachedPolicies"]:
-                policy_type = "AWS Managed" if pol["PolicyArn"].startswith("arn:aws:iam::aws:") else "Customer Managed"
-                rows.extend(_get_policy_statements(iam, pol["PolicyArn"], pol["PolicyName"], policy_type))
+        attached, inline = _list_role_policies(iam, role_name)
 
-        # Inline policies (paginated)
-        paginator = iam.get_paginator("list_role_policies")
-        for page in paginator.paginate(RoleName=role_name):
-            for pol_name in page["PolicyNames"]:
-                response = iam.get_role_policy(RoleName=role_name, PolicyName=pol_name)
-                document = _decode_policy_document(response["PolicyDocument"])
-                rows.extend(_flatten_statements(pol_name, "Inline", document))
+        # Fetch managed and inline policies concurrently; map() preserves order
+        with ThreadPoolExecutor(max_workers=_POLICY_WORKERS) as pool:
+            managed_results = pool.map(lambda t: _get_policy_statements(iam, *t, policy_cache), attached)
+            inline_results = pool.map(lambda n: _get_role_inline_statements(iam, role_name, n), inline)
+            for policy_rows in managed_results:
+                rows.extend(policy_rows)
+            for policy_rows in inline_results:
+                rows.extend(policy_rows)
 
     except ClientError as e:
         code = e.response["Error"]["Code"]
@@ -91,16 +158,16 @@ def scan_role(session: boto3.Session, role_name: str) -> list[dict]:
     return rows
 
 
-def scan_policy(session: boto3.Session, policy_identifier: str) -> list[dict]:
+def scan_policy(session: boto3.Session, policy_identifier: str) -> list[PermissionRow]:
     """Scan a standalone policy by name or ARN and return flattened permission rows."""
-    iam = session.client("iam")
+    iam = get_client(session, "iam")
 
     # Determine if it's an ARN or a name
     if policy_identifier.startswith("arn:"):
         policy_arn = policy_identifier
     else:
         # Search for the policy by name across all policies
-        policy_arn = _find_policy_arn(iam, policy_identifier)
+        policy_arn = _find_policy_arn(session, iam, policy_identifier)
 
     try:
         policy_name = policy_arn.split("/")[-1]
@@ -113,14 +180,67 @@ def scan_policy(session: boto3.Session, policy_identifier: str) -> list[dict]:
         sys.exit(1)
 
 
-def _find_policy_arn(iam, policy_name: str) -> str:
-    """Find a policy ARN by name, searching both local and AWS scopes."""
-    for scope in ("Local", "AWS"):
-        paginator = iam.get_paginator("list_policies")
-        for page in paginator.paginate(Scope=scope):
-            for pol in page["Policies"]:
-                if pol["PolicyName"] == policy_name:
-                    return pol["Arn"]
+@functools.lru_cache(maxsize=32)
+def _caller_account_id(session: boto3.Session) -> str:
+    """Return the account ID behind a session's credentials (cached per session)."""
+    return get_client(session, "sts").get_caller_identity()["Account"]
+
+
+def _policy_exists(iam, policy_arn: str) -> bool:
+    """Return True if get_policy succeeds for the given ARN."""
+    try:
+        iam.get_policy(PolicyArn=policy_arn)
+    except ClientError:
+        return False
+    return True
+
+
+def _scan_scope(iam, scope: str, policy_name: str, stop: threading.Event) -> str | None:
+    """Page through list_policies for one scope until the name is found or stop is set."""
+    paginator = iam.get_paginator("list_policies")
+    for page in paginator.paginate(Scope=scope, PaginationConfig=_PAGE_CONFIG):
+        for pol in page["Policies"]:
+            if pol["PolicyName"] == policy_name:
+                return pol["Arn"]
+        if stop.is_set():
+            break
+    return None
+
+
+def _find_policy_arn(session: boto3.Session, iam, policy_name: str) -> str:
+    """Find a policy ARN by name, searching both local and AWS scopes.
+
+    Customer-managed policies take precedence over AWS-managed ones, at any
+    path. The root-path customer ARN is probed directly first. If the
+    root-path AWS ARN exists, only the Local scope still has to be listed
+    (a customer policy under a non-default path wins); otherwise both scopes
+    are paged through.
+    """
+    try:
+        customer_arn = f"arn:aws:iam::{_caller_account_id(session)}:policy/{policy_name}"
+        if _policy_exists(iam, customer_arn):
+            return customer_arn
+    except ClientError:
+        pass
+
+    aws_arn = f"arn:aws:iam::aws:policy/{policy_name}"
+    if _policy_exists(iam, aws_arn):
+        return _scan_scope(iam, "Local", policy_name, threading.Event()) or aws_arn
+
+    # Page through both scopes concurrently. Local keeps precedence: an AWS
+    # match is only used once the Local sweep has come up empty, and a Local
+    # match cuts the AWS sweep short.
+    stop_aws = threading.Event()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        local_future = pool.submit(_scan_scope, iam, "Local", policy_name, threading.Event())
+        aws_future = pool.submit(_scan_scope, iam, "AWS", policy_name, stop_aws)
+        arn = local_future.result()
+        if arn:
+            stop_aws.set()
+            return arn
+        arn = aws_future.result()
+        if arn:
+            return arn
 
     print(f"[error] Policy '{policy_name}' not found in Local or AWS scopes.", file=sys.stderr)
     sys.exit(1)
@@ -135,11 +255,12 @@ def scan_user(session: boto3.Session, user_name: str) -> dict:
             "groups": [dict, ...],
             "access_keys": [dict, ...],
             "mfa_devices": [dict, ...],
-            "direct_policies": [row_dict, ...],
-            "group_policies": {group_name: [row_dict, ...]},
+            "direct_policies": [PermissionRow, ...],
+            "group_policies": {group_name: [PermissionRow, ...]},
         }
     """
-    iam = session.client("iam")
+    iam = get_client(session, "iam")
+    policy_cache: dict = {}
 
     try:
         user = iam.get_user(UserName=user_name)["User"]
@@ -152,13 +273,13 @@ def scan_user(session: boto3.Session, user_name: str) -> dict:
     # Group memberships
     groups = []
     paginator = iam.get_paginator("list_groups_for_user")
-    for page in paginator.paginate(UserName=user_name):
+    for page in paginator.paginate(UserName=user_name, PaginationConfig=_PAGE_CONFIG):
         groups.extend(page["Groups"])
 
     # Access keys + last-used info
     access_keys = []
     paginator = iam.get_paginator("list_access_keys")
-    for page in paginator.paginate(UserName=user_name):
+    for page in paginator.paginate(UserName=user_name, PaginationConfig=_PAGE_CONFIG):
         for key in page["AccessKeyMetadata"]:
             info = dict(key)
             try:
@@ -175,41 +296,41 @@ def scan_user(session: boto3.Session, user_name: str) -> dict:
     # MFA devices
     mfa_devices = []
     paginator = iam.get_paginator("list_mfa_devices")
-    for page in paginator.paginate(UserName=user_name):
+    for page in paginator.paginate(UserName=user_name, PaginationConfig=_PAGE_CONFIG):
         mfa_devices.extend(page["MFADevices"])
 
     # Direct attached managed policies
     direct_rows = []
     paginator = iam.get_paginator("list_attached_user_policies")
-    for page in paginator.paginate(UserName=user_name):
+    for page in paginator.paginate(UserName=user_name, PaginationConfig=_PAGE_CONFIG):
         for pol in page["AttachedPolicies"]:
             policy_type = "AWS Managed" if pol["PolicyArn"].startswith("arn:aws:iam::aws:") else "Customer Managed"
-            direct_rows.extend(_get_policy_statements(iam, pol["PolicyArn"], pol["PolicyName"], policy_type))
+            direct_rows.extend(_get_policy_statements(iam, pol["PolicyArn"], pol["PolicyName"], policy_type, policy_cache))
 
     # Direct inline policies
     paginator = iam.get_paginator("list_user_policies")
-    for page in paginator.paginate(UserName=user_name):
+    for page in paginator.paginate(UserName=user_name, PaginationConfig=_PAGE_CONFIG):
         for pol_name in page["PolicyNames"]:
             resp = iam.get_user_policy(UserName=user_name, PolicyName=pol_name)
             document = _decode_policy_document(resp["PolicyDocument"])
             direct_rows.extend(_flatten_statements(pol_name, "Inline", document))
 
     # Group-inherited policies (attached + inline per group)
-    group_policies: dict[str, list[dict]] = {}
+    group_policies: dict[str, list[PermissionRow]] = {}
     for grp in groups:
         grp_name = grp["GroupName"]
-        g_rows: list[dict] = []
+        g_rows: list[PermissionRow] = []
         try:
             paginator = iam.get_paginator("list_attached_group_policies")
-            for page in paginator.paginate(GroupName=grp_name):
+            for page in paginator.paginate(GroupName=grp_name, PaginationConfig=_PAGE_CONFIG):
                 for pol in page["AttachedPolicies"]:
                     policy_type = "AWS Managed" if pol["PolicyArn"].startswith("arn:aws:iam::aws:") else "Customer Managed"
-                    g_rows.extend(_get_policy_statements(iam, pol["PolicyArn"], pol["PolicyName"], policy_type))
+                    g_rows.extend(_get_policy_statements(iam, pol["PolicyArn"], pol["PolicyName"], policy_type, policy_cache))
         except ClientError:
             pass
         try:
             paginator = iam.get_paginator("list_group_policies")
-            for page in paginator.paginate(GroupName=grp_name):
+            for page in paginator.paginate(GroupName=grp_name, PaginationConfig=_PAGE_CONFIG):
                 for pol_name in page["PolicyNames"]:
                     resp = iam.get_group_policy(GroupName=grp_name, PolicyName=pol_name)
                     document = _decode_policy_document(resp["PolicyDocument"])
@@ -235,19 +356,19 @@ def scan_group(session: boto3.Session, group_name: str) -> dict:
         {
             "group": dict,
             "members": [dict, ...],
-            "policies": [row_dict, ...],
+            "policies": [PermissionRow, ...],
         }
     """
-    iam = session.client("iam")
+    iam = get_client(session, "iam")
 
     group = None
     members: list[dict] = []
     try:
-        resp = iam.get_group(GroupName=group_name)
+        resp = iam.get_group(GroupName=group_name, MaxItems=_PAGE_SIZE)
         group = resp["Group"]
         members.extend(resp["Users"])
         while resp.get("IsTruncated"):
-            resp = iam.get_group(GroupName=group_name, Marker=resp["Marker"])
+            resp = iam.get_group(GroupName=group_name, Marker=resp["Marker"], MaxItems=_PAGE_SIZE)
             members.extend(resp["Users"])
     except ClientError as e:
         code = e.response["Error"]["Code"]
@@ -255,12 +376,12 @@ def scan_group(session: boto3.Session, group_name: str) -> dict:
         print(f"[error] Failed to get group '{group_name}': {code} — {msg}", file=sys.stderr)
         sys.exit(1)
 
-    rows: list[dict] = []
+    rows: list[PermissionRow] = []
 
     # Attached managed policies
     try:
         paginator = iam.get_paginator("list_attached_group_policies")
-        for page in paginator.paginate(GroupName=group_name):
+        for page in paginator.paginate(GroupName=group_name, PaginationConfig=_PAGE_CONFIG):
             for pol in page["AttachedPolicies"]:
                 policy_type = "AWS Managed" if pol["PolicyArn"].startswith("arn:aws:iam::aws:") else "Customer Managed"
                 rows.extend(_get_policy_statements(iam, pol["PolicyArn"], pol["PolicyName"], policy_type))
@@ -270,7 +391,7 @@ def scan_group(session: boto3.Session, group_name: str) -> dict:
     # Inline policies
     try:
         paginator = iam.get_paginator("list_group_policies")
-        for page in paginator.paginate(GroupName=group_name):
+        for page in paginator.paginate(GroupName=group_name, PaginationConfig=_PAGE_CONFIG):
             for pol_name in page["PolicyNames"]:
                 resp_pol = iam.get_group_policy(GroupName=group_name, PolicyName=pol_name)
                 document = _decode_policy_document(resp_pol["PolicyDocument"])
@@ -285,59 +406,77 @@ def scan_group(session: boto3.Session, group_name: str) -> dict:
     }
 
 
-def _action_matches(policy_action: str, search_pattern: str) -> bool:
-    """Bidirectional case-insensitive fnmatch for IAM actions.
+@functools.lru_cache(maxsize=4096)
+def _compile_glob(pattern: str) -> re.Pattern:
+    """Compile an fnmatch-style glob into a regex, once per distinct pattern."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+def _has_glob(s: str) -> bool:
+    """Return True if s contains any fnmatch wildcard character."""
+    return "*" in s or "?" in s or "[" in s
+
+
+@functools.lru_cache(maxsize=32)
+def _action_matcher(search_pattern: str):
+    """Build a bidirectional case-insensitive fnmatch predicate for IAM actions.
 
     Checks both directions so that a policy action like 's3:*' matches a
     search for 's3:CreateBucket', and a search for 's3:*' matches a
-    specific policy action like 's3:CreateBucket'.
+    specific policy action like 's3:CreateBucket'. The search pattern is
+    lowered and compiled once, and the predicate is shared by every role
+    scanned for the same pattern; each distinct policy action is lowered
+    and matched only once. A literal pattern is compared with ==, and the
+    reverse direction is only tried for actions that contain a wildcard.
     """
-    a = policy_action.lower()
     p = search_pattern.lower()
-    return fnmatch.fnmatch(a, p) or fnmatch.fnmatch(p, a)
+    pattern_match = _compile_glob(p).match if _has_glob(p) else None
+    seen: dict[str, bool] = {}
+
+    def matches(policy_action: str) -> bool:
+        hit = seen.get(policy_action)
+        if hit is None:
+            a = policy_action.lower()
+            if pattern_match is None:
+                hit = a == p
+            else:
+                hit = pattern_match(a) is not None
+            if not hit and _has_glob(a):
+                hit = _compile_glob(a).match(p) is not None
+            seen[policy_action] = hit
+        return hit
+
+    return matches
 
 
 def scan_role_for_action(session: boto3.Session, role_name: str,
-                         search_pattern: str, policy_cache: dict | None = None) -> list[dict]:
+                         search_pattern: str, policy_cache: dict | None = None) -> list[PermissionRow]:
     """Scan a role's policies and return rows where the action matches the search pattern.
 
     Args:
         session: Authenticated boto3 session.
         role_name: IAM role to scan.
         search_pattern: Action pattern (e.g. 's3:CreateBucket', 's3:*').
-        policy_cache: Optional dict keyed by policy ARN → list[dict] rows,
-                      shared across roles in the same account to avoid redundant API calls.
+        policy_cache: Optional dict keyed by policy ARN → list[PermissionRow],
+                      shared across roles (and accounts) to avoid redundant API calls.
 
     Returns:
-        List of permission row dicts that match the action pattern.
+        List of PermissionRow entries whose action matches the pattern.
     """
-    if policy_cache is None:
-        policy_cache = {}
-
-    iam = session.client("iam")
+    iam = get_client(session, "iam")
     all_rows = []
 
     try:
-        # Attached managed policies (paginated)
-        paginator = iam.get_paginator("list_attached_role_policies")
-        for page in paginator.paginate(RoleName=role_name):
-            for pol in page["AttachedPolicies"]:
-                arn = pol["PolicyArn"]
-                if arn in policy_cache:
-                    all_rows.extend(policy_cache[arn])
-                else:
-                    policy_type = "AWS Managed" if arn.startswith("arn:aws:iam::aws:") else "Customer Managed"
-                    rows = _get_policy_statements(iam, arn, pol["PolicyName"], policy_type)
-                    policy_cache[arn] = rows
-                    all_rows.extend(rows)
-
-        # Inline policies (paginated)
-        paginator = iam.get_paginator("list_role_policies")
-        for page in paginator.paginate(RoleName=role_name):
-            for pol_name in page["PolicyNames"]:
-                response = iam.get_role_policy(RoleName=role_name, PolicyName=pol_name)
-                document = _decode_policy_document(response["PolicyDocument"])
-                all_rows.extend(_flatten_statements(pol_name, "Inline", document))
+        attached, inline = _list_role_policies(iam, role_name)
+
+        # Fetch managed and inline policies concurrently; map() preserves order
+        with ThreadPoolExecutor(max_workers=_POLICY_WORKERS) as pool:
+            managed_results = pool.map(lambda t: _get_policy_statements(iam, *t, policy_cache), attached)
+            inline_results = pool.map(lambda n: _get_role_inline_statements(iam, role_name, n), inline)
+            for policy_rows in managed_results:
+                all_rows.extend(policy_rows)
+            for policy_rows in inline_results:
+                all_rows.extend(policy_rows)
 
     except ClientError as e:
         code = e.response["Error"]["Code"]
@@ -346,12 +485,13 @@ def scan_role_for_action(session: boto3.Session, role_name: str,
         return []
 
     # Filter rows by action match
+    action_matches = _action_matcher(search_pattern)
     matched = []
     for row in all_rows:
-        action_value = row["Action"]
+        action_value = row.Action
         # Strip NotAction prefix for matching but keep it in output
-        raw_action = action_value.removeprefix("NotAction: ")
-        if _action_matches(raw_action, search_pattern):
+        raw_action = action_value.removeprefix(_NOT_ACTION_PREFIX)
+        if action_matches(raw_action):
             matched.append(row)
 
     return matched
@@ -1,27 +1,53 @@
-import fnmatch
+import functools
+import re
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
-from catrole.auth import assume_role
-from catrole.scanner import scan_role_for_action
+from catrole.auth import assume_role, get_client
+from catrole.boto_config import AWS_CONFIG
+from catrole.models import RoleMatch
+from catrole.scanner import _PAGE_CONFIG, _compile_glob, scan_role_for_action
 
 _MAX_WORKERS = 10
+# Upper bound on the per-account list_attached_role_policies fan-out in the listing fallback
+_ROLE_WORKERS = 8
 
+# AWS-managed policy ARNs; these are the same in every account
+_AWS_POLICY_PREFIX = "arn:aws:iam::aws:"
 
-def list_active_accounts() -> list[dict]:
-    """List all active accounts in the AWS Organization. Returns [{Id, Name}, ...]."""
+# Minimum seconds between progress_callback calls (the first and last are always made)
+_PROGRESS_INTERVAL = 0.25
+
+# Process-local GetAccountAuthorizationDetails snapshots, keyed by (account ID, assumed role).
+# Repeat searches within the TTL are matched in memory without any AWS calls.
+_SNAPSHOT_TTL = 60.0
+_SNAPSHOT_MAXSIZE = 512
+# Each snapshot is (roles, policies); a part is None when it was not fetched.
+_snapshot_cache: dict[tuple[str, str], tuple[float, tuple[list[dict] | None, list[dict] | None]]] = {}
+_snapshot_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _organizations_client():
+    """The caller's Organizations client, created once per process with the shared config."""
+    return boto3.client("organizations", config=AWS_CONFIG)
+
+
+def iter_active_accounts() -> Iterator[dict]:
+    """Yield each active account in the AWS Organization as {Id, Name}, page by page."""
     try:
-        org = boto3.client("organizations")
-        accounts = []
+        org = _organizations_client()
         paginator = org.get_paginator("list_accounts")
         for page in paginator.paginate():
             for acct in page["Accounts"]:
                 if acct["Status"] == "ACTIVE":
-                    accounts.append({"Id": acct["Id"], "Name": acct["Name"]})
-        return accounts
+                    yield {"Id": acct["Id"], "Name": acct["Name"]}
     except NoCredentialsError:
         print("[error] No AWS credentials found. Configure your AWS credentials first.", file=sys.stderr)
         sys.exit(1)
@@ -32,20 +58,102 @@ def list_active_accounts() -> list[dict]:
         sys.exit(1)
 
 
-def _match(name: str, pattern: str) -> bool:
-    """Case-sensitive fnmatch wildcard matching."""
-    return fnmatch.fnmatch(name, pattern)
+def list_active_accounts() -> list[dict]:
+    """List all active accounts in the AWS Organization. Returns [{Id, Name}, ...]."""
+    return list(iter_active_accounts())
+
+
+def clear_search_cache() -> None:
+    """Drop all cached account snapshots."""
+    with _snapshot_lock:
+        _snapshot_cache.clear()
+
+
+def _get_cached_snapshot(key: tuple[str, str]) -> tuple[list[dict] | None, list[dict] | None] | None:
+    with _snapshot_lock:
+        entry = _snapshot_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+
+def _store_snapshot(key: tuple[str, str], snapshot: tuple[list[dict] | None, list[dict] | None]) -> None:
+    with _snapshot_lock:
+        _snapshot_cache.pop(key, None)
+        if len(_snapshot_cache) >= _SNAPSHOT_MAXSIZE:
+            # Dicts keep insertion order — evict the oldest snapshot
+            del _snapshot_cache[next(iter(_snapshot_cache))]
+        _snapshot_cache[key] = (time.monotonic() + _SNAPSHOT_TTL, snapshot)
+
+
+@functools.lru_cache(maxsize=256)
+def resolve_account_name(account_id: str) -> str:
+    """Return the account's Organizations name, or the ID if it cannot be looked up.
+
+    describe_account only works from the management (or delegated admin)
+    account, so AccessDenied is common and simply falls back to the ID.
+    """
+    try:
+        desc = _organizations_client().describe_account(AccountId=account_id)
+        return desc["Account"]["Name"]
+    except Exception:
+        return account_id
+
+
+def _target_accounts(account_id: str | None, resolve_name: bool) -> Iterable[dict]:
+    """The accounts to search: the single given account, or all active org accounts (lazily)."""
+    if account_id:
+        account_name = resolve_account_name(account_id) if resolve_name else account_id
+        return [{"Id": account_id, "Name": account_name}]
+    return iter_active_accounts()
+
+
+def _extract_literal_prefix(pattern: str) -> str:
+    """Return the part of a wildcard pattern before the first *, ? or [."""
+    for i, ch in enumerate(pattern):
+        if ch in "*?[":
+            return pattern[:i]
+    return pattern
+
+
+def _path_prefix(pattern: str) -> str | None:
+    """PathPrefix for list_roles/list_policies, or None if the pattern is not path-qualified.
+
+    A pattern starting with "/" is matched against Path + name (e.g.
+    '/service-role/*'). The literal prefix is cut back to its last "/" so
+    that only the path part is sent to IAM.
+    """
+    if not pattern.startswith("/"):
+        return None
+    literal = _extract_literal_prefix(pattern)
+    return literal[:literal.rindex("/") + 1]
+
+
+def _role_workers(concurrent_accounts: int) -> int:
+    """Inner pool size per account, so all accounts together stay near 2 × _MAX_WORKERS threads.
+
+    A single account gets the full _ROLE_WORKERS; with --workers 50 each
+    account lists attached policies serially instead of adding 400 threads.
+    """
+    return min(_ROLE_WORKERS, max(1, _MAX_WORKERS * 2 // concurrent_accounts))
 
 
-def _search_account(account: dict, pattern: str, role_name: str) -> dict:
+def _search_account(account: dict, pattern: str, role_name: str, only_attached: bool = False,
+                    search_roles: bool = True, search_policies: bool = True,
+                    role_workers: int = _ROLE_WORKERS) -> dict:
     """Search a single account for roles and policies matching the wildcard pattern.
 
+    With only_attached, customer-managed policies not attached to any
+    user, group or role are left out. search_roles/search_policies turn
+    off the role or policy half of the search, skipping its API calls.
+    role_workers sizes the attached-policy fan-out in the listing fallback.
+
     Returns:
         {
             "AccountId": str,
             "AccountName": str,
-            "roles": [{"RoleName": str, "AttachedPolicies": [str, ...]}, ...],
-            "policies": [{"PolicyName": str}, ...],
+            "roles": [RoleMatch(name, policies), ...],
+            "policies": [{"PolicyArn": str}, ...],
             "error": str | None,
         }
     """
@@ -59,116 +167,343 @@ def _search_account(account: dict, pattern: str, role_name: str) -> dict:
         "error": None,
     }
 
-    try:
-        session = assume_role(account_id, role_name)
-    except SystemExit:
-        # assume_role calls sys.exit on failure — catch and record as error
-        result["error"] = f"Cannot assume {role_name}"
-        return result
+    path_prefix = _path_prefix(pattern)
+    pattern = _compile_glob(pattern)
+
+    cache_key = (account_id, role_name)
+    snapshot = _get_cached_snapshot(cache_key)
+    if snapshot is None or (search_roles and snapshot[0] is None) or (search_policies and snapshot[1] is None):
+        try:
+            session = assume_role(account_id, role_name)
+        except SystemExit:
+            # assume_role calls sys.exit on failure — catch and record as error
+            result["error"] = f"Cannot assume {role_name}"
+            return result
+
+        iam = get_client(session, "iam")
+
+        try:
+            snapshot = _authorization_snapshot(iam, search_roles, search_policies)
+        except ClientError:
+            # GetAccountAuthorizationDetails denied or failed (e.g. throttled past the
+            # retry budget) — fall back to the per-role listing calls, which record
+            # their own errors
+            _search_listings(iam, pattern, path_prefix, only_attached, search_roles, search_policies,
+                             role_workers, result)
+            return result
+
+        _store_snapshot(cache_key, snapshot)
+
+    _search_snapshot(snapshot, pattern, path_prefix, only_attached, search_roles, search_policies, result)
+    return result
+
 
-    iam = session.client("iam")
+def _authorization_snapshot(iam, fetch_roles: bool = True,
+                            fetch_policies: bool = True) -> tuple[list[dict] | None, list[dict] | None]:
+    """Fetch every role (with attached policy names) and customer-managed policy in one account.
+
+    GetAccountAuthorizationDetails returns every role with its attached managed
+    policies, plus all local managed policies, so no per-role calls are needed.
+    Only the fields the search needs are kept, not the policy documents. A
+    part that is not fetched is returned as None.
+    """
+    entity_filter = []
+    if fetch_roles:
+        entity_filter.append("Role")
+    if fetch_policies:
+        entity_filter.append("LocalManagedPolicy")
+
+    roles = [] if fetch_roles else None
+    policies = [] if fetch_policies else None
+    roles_append = roles.append if fetch_roles else None
+    policies_append = policies.append if fetch_policies else None
+    paginator = iam.get_paginator("get_account_authorization_details")
+    for page in paginator.paginate(Filter=entity_filter, PaginationConfig=_PAGE_CONFIG):
+        for role in page.get("RoleDetailList", []) if fetch_roles else ():
+            roles_append({
+                "Path": role["Path"],
+                "RoleName": role["RoleName"],
+                "AttachedPolicies": tuple(pol["PolicyName"] for pol in role.get("AttachedManagedPolicies", [])),
+            })
+        for pol in page.get("Policies", []) if fetch_policies else ():
+            policies_append({
+                "Path": pol["Path"],
+                "PolicyName": pol["PolicyName"],
+                "Arn": pol["Arn"],
+                "AttachmentCount": pol.get("AttachmentCount", 0),
+            })
+    return roles, policies
+
+
+def _search_snapshot(snapshot: tuple[list[dict] | None, list[dict] | None], pattern: re.Pattern,
+                     path_prefix: str | None, only_attached: bool,
+                     search_roles: bool, search_policies: bool, result: dict) -> None:
+    """Collect matching roles and policies from an account snapshot.
+
+    The snapshot has no server-side path filter, so path-qualified patterns
+    are matched here against Path + name.
+    """
+    # Hot loop over every role/policy in the account — bind lookups once
+    path_qualified = path_prefix is not None
+    match = pattern.match
+    roles, policies = snapshot
+    if search_roles:
+        roles_append = result["roles"].append
+        for role in roles:
+            name = role["RoleName"]
+            if match(role["Path"] + name if path_qualified else name):
+                roles_append(RoleMatch(name, role["AttachedPolicies"]))
+    if search_policies:
+        policies_append = result["policies"].append
+        for pol in policies:
+            if only_attached and not pol["AttachmentCount"]:
+                continue
+            name = pol["PolicyName"]
+            if match(pol["Path"] + name if path_qualified else name):
+                policies_append({"PolicyArn": pol["Arn"]})
+
+
+def _list_attached(iam, role_name: str) -> list[str]:
+    """Return the names of the managed policies attached to a role."""
+    attached = []
+    paginator = iam.get_paginator("list_attached_role_policies")
+    for page in paginator.paginate(RoleName=role_name, PaginationConfig=_PAGE_CONFIG):
+        for pol in page["AttachedPolicies"]:
+            attached.append(pol["PolicyName"])
+    return attached
+
+
+def _search_listings(iam, pattern: re.Pattern, path_prefix: str | None, only_attached: bool,
+                     search_roles: bool, search_policies: bool, role_workers: int, result: dict) -> None:
+    """Collect matching roles and policies via list_roles/list_attached_role_policies/list_policies.
+
+    For path-qualified patterns IAM filters by PathPrefix server-side; the
+    full pattern is still applied to Path + name here.
+    """
+    path_qualified = path_prefix is not None
+    list_kwargs = {"PaginationConfig": _PAGE_CONFIG}
+    if path_qualified:
+        list_kwargs["PathPrefix"] = path_prefix
 
     # Search roles
+    if search_roles:
+        _search_listed_roles(iam, pattern, path_qualified, list_kwargs, role_workers, result)
+
+    # Search policies (customer managed only — Local scope)
+    if search_policies:
+        _search_listed_policies(iam, pattern, path_qualified, only_attached, list_kwargs, result)
+
+
+def _search_listed_roles(iam, pattern: re.Pattern, path_qualified: bool, list_kwargs: dict,
+                         role_workers: int, result: dict) -> None:
+    """Match roles from list_roles, then fetch each match's attached policies."""
+    match = pattern.match
     try:
+        matched = []
+        matched_append = matched.append
         paginator = iam.get_paginator("list_roles")
-        for page in paginator.paginate():
+        for page in paginator.paginate(**list_kwargs):
             for role in page["Roles"]:
-                if _match(role["RoleName"], pattern):
-                    # Get attached policies for this role
-                    attached = []
-                    pol_paginator = iam.get_paginator("list_attached_role_policies")
-                    for pol_page in pol_paginator.paginate(RoleName=role["RoleName"]):
-                        for pol in pol_page["AttachedPolicies"]:
-                            attached.append(pol["PolicyName"])
-                    result["roles"].append({
-                        "RoleName": role["RoleName"],
-                        "AttachedPolicies": attached,
-                    })
+                name = role["RoleName"]
+                if match(role["Path"] + name if path_qualified else name):
+                    matched_append(name)
+
+        # Get attached policies for the matched roles concurrently; map() preserves order
+        roles_append = result["roles"].append
+        with ThreadPoolExecutor(max_workers=role_workers) as pool:
+            for name, attached in zip(matched, pool.map(lambda rn: _list_attached(iam, rn), matched)):
+                roles_append(RoleMatch(name, tuple(attached)))
     except ClientError as e:
         result["error"] = f"Role listing failed: {e.response['Error']['Code']}"
 
-    # Search policies (customer managed only — Local scope)
+
+def _search_listed_policies(iam, pattern: re.Pattern, path_qualified: bool, only_attached: bool,
+                            list_kwargs: dict, result: dict) -> None:
+    """Match customer-managed policies from list_policies."""
+    match = pattern.match
     try:
+        policies_append = result["policies"].append
         paginator = iam.get_paginator("list_policies")
-        for page in paginator.paginate(Scope="Local"):
+        for page in paginator.paginate(Scope="Local", OnlyAttached=only_attached, **list_kwargs):
             for pol in page["Policies"]:
-                if _match(pol["PolicyName"], pattern):
-                    result["policies"].append({"PolicyArn": pol["Arn"]})
+                name = pol["PolicyName"]
+                if match(pol["Path"] + name if path_qualified else name):
+                    policies_append({"PolicyArn": pol["Arn"]})
     except ClientError as e:
         if result["error"]:
             result["error"] += f"; Policy listing failed: {e.response['Error']['Code']}"
         else:
             result["error"] = f"Policy listing failed: {e.response['Error']['Code']}"
 
-    return result
 
+def _throttle_progress(callback, interval: float = _PROGRESS_INTERVAL):
+    """Wrap a progress callback so it fires at most once per interval, plus the first and final update."""
+    last = -interval
 
-def search_all_accounts(pattern: str, role_name: str, account_id: str | None = None, progress_callback=None) -> list[dict]:
-    """Search org accounts for roles/policies matching the wildcard pattern.
+    def throttled(name: str, idx: int, total: int | None) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if idx == 1 or idx == total or now - last >= interval:
+            last = now
+            callback(name, idx, total)
+
+    return throttled
+
+
+def _run_accounts(fn, accounts: Iterable[dict], max_workers: int,
+                  *args) -> Iterator[tuple[dict, Future, int | None]]:
+    """Run fn(account, *args) on a thread pool, yielding (account, future, total) as each finishes.
+
+    At most 2 × max_workers accounts are in flight; the next account is only
+    taken from the iterable when one completes, so memory stays bounded no
+    matter how many accounts there are, and searches start while a lazy
+    account listing is still paging. total is None until the iterable is
+    exhausted, then the number of accounts.
+    """
+    accounts = iter(accounts)
+    submitted = 0
+    total = None
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        in_flight = {}
+
+        def submit_next() -> bool:
+            nonlocal submitted
+            acct = next(accounts, None)
+            if acct is None:
+                return False
+            in_flight[pool.submit(fn, acct, *args)] = acct
+            submitted += 1
+            return True
+
+        try:
+            while len(in_flight) < 2 * max_workers:
+                if not submit_next():
+                    total = submitted
+                    break
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    acct = in_flight.pop(future)
+                    if total is None and not submit_next():
+                        total = submitted
+                    yield acct, future, total
+        finally:
+            # Consumer stopped early — don't start accounts that are still queued
+            for future in in_flight:
+                future.cancel()
+
+
+def iter_search_all_accounts(pattern: str, role_name: str, account_id: str | None = None, progress_callback=None,
+                             max_workers: int = _MAX_WORKERS, resolve_name: bool = False,
+                             only_attached: bool = False, search_roles: bool = True,
+                             search_policies: bool = True) -> Iterator[dict]:
+    """Search org accounts for roles/policies matching the wildcard pattern, yielding as accounts finish.
 
     Args:
         pattern: Wildcard pattern (e.g. '*lambda*')
         role_name: IAM role name to assume in each account.
         account_id: Optional single account ID to scope the search to.
                     If None, searches all active org accounts.
-        progress_callback: Optional callable(account_name, idx, total) for progress updates.
-
-    Returns list of result dicts from _search_account (only those with matches).
+        progress_callback: Optional callable(account_name, idx, total) for progress updates;
+                           total is None while the org's accounts are still being listed.
+                           Called at most every 0.25 s, plus for the first and last account.
+        max_workers: Number of accounts searched concurrently.
+        resolve_name: With account_id, look up the account's name via Organizations
+                      (one extra call); otherwise the ID is used as the name.
+        only_attached: Skip customer-managed policies that are not attached to anything.
+        search_roles: Search role names (False skips all role listing calls).
+        search_policies: Search customer-managed policy names (False skips all policy listing calls).
+
+    Yields result dicts from _search_account (only those with matches), in completion order.
     """
-    if account_id:
-        # Resolve account name via Organizations (falls back to ID)
-        account_name = account_id
+    accounts = _target_accounts(account_id, resolve_name)
+    if progress_callback:
+        progress_callback = _throttle_progress(progress_callback)
+
+    idx = 0
+    # Accounts searched at once: just the one with account_id, else up to max_workers
+    role_workers = _role_workers(1 if account_id else max_workers)
+    completed = _run_accounts(_search_account, accounts, max_workers, pattern, role_name,
+                              only_attached, search_roles, search_policies, role_workers)
+    for idx, (acct, future, total) in enumerate(completed, 1):
+        if progress_callback:
+            progress_callback(acct["Name"], idx, total)
+
         try:
-            org = boto3.client("organizations")
-            desc = org.describe_account(AccountId=account_id)
-            account_name = desc["Account"]["Name"]
-        except Exception:
-            pass
-        accounts = [{"Id": account_id, "Name": account_name}]
-    else:
-        accounts = list_active_accounts()
-    total = len(accounts)
-
-    if not accounts:
+            result = future.result()
+        except Exception as exc:
+            result = {
+                "AccountId": acct["Id"],
+                "AccountName": acct["Name"],
+                "roles": [],
+                "policies": [],
+                "error": str(exc),
+            }
+
+        # Only yield results that have matches
+        if result["roles"] or result["policies"]:
+            yield result
+
+    if not idx:
         print("[warn] No active accounts found in the organization.", file=sys.stderr)
-        return []
 
-    results = []
 
-    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool:
-        future_to_acct = {
-            pool.submit(_search_account, acct, pattern, role_name): acct
-            for acct in accounts
-        }
+def search_all_accounts(pattern: str, role_name: str, account_id: str | None = None, progress_callback=None,
+                        max_workers: int = _MAX_WORKERS, resolve_name: bool = False,
+                        only_attached: bool = False, search_roles: bool = True,
+                        search_policies: bool = True) -> list[dict]:
+    """Search org accounts for roles/policies matching the wildcard pattern.
 
-        for idx, future in enumerate(as_completed(future_to_acct), 1):
-            acct = future_to_acct[future]
-            if progress_callback:
-                progress_callback(acct["Name"], idx, total)
-
-            try:
-                result = future.result()
-            except Exception as exc:
-                result = {
-                    "AccountId": acct["Id"],
-                    "AccountName": acct["Name"],
-                    "roles": [],
-                    "policies": [],
-                    "error": str(exc),
-                }
-
-            # Only keep results that have matches
-            if result["roles"] or result["policies"]:
-                results.append(result)
+    Same arguments as iter_search_all_accounts. Returns the results with
+    matches, sorted by account name.
+    """
+    results = list(iter_search_all_accounts(
+        pattern, role_name, account_id=account_id,
+        progress_callback=progress_callback, max_workers=max_workers, resolve_name=resolve_name,
+        only_attached=only_attached, search_roles=search_roles, search_policies=search_policies,
+    ))
 
     # Sort by account name for consistent output
     results.sort(key=lambda r: r["AccountName"])
     return results
 
 
-def _find_action_in_account(account: dict, search_pattern: str, role_name: str) -> dict:
+class _AccountPolicyCache(dict):
+    """Policy rows cache for one account that keeps AWS-managed entries in a shared dict.
+
+    AWS-managed policies are identical in every account, so their rows are
+    reused across the whole run. Customer-managed rows live only in this
+    dict and are freed when the account's search finishes.
+    """
+
+    def __init__(self, aws_policy_cache: dict):
+        super().__init__()
+        self._aws = aws_policy_cache
+
+    def __contains__(self, arn):
+        if arn.startswith(_AWS_POLICY_PREFIX):
+            return arn in self._aws
+        return super().__contains__(arn)
+
+    def __getitem__(self, arn):
+        if arn.startswith(_AWS_POLICY_PREFIX):
+            return self._aws[arn]
+        return super().__getitem__(arn)
+
+    def __setitem__(self, arn, rows):
+        if arn.startswith(_AWS_POLICY_PREFIX):
+            self._aws[arn] = rows
+        else:
+            super().__setitem__(arn, rows)
+
+
+def _find_action_in_account(account: dict, search_pattern: str, role_name: str,
+                            aws_policy_cache: dict | None = None) -> dict:
     """Search a single account for roles whose policies match the given IAM action pattern.
 
+    aws_policy_cache may be shared across accounts and only ever holds
+    AWS-managed policies; customer-managed policies are cached per account.
+
     Returns:
         {
             "AccountId": str,
@@ -192,12 +527,12 @@ def _find_action_in_account(account: dict, search_pattern: str, role_name: str)
         result["error"] = f"Cannot assume {role_name}"
         return result
 
-    iam = session.client("iam")
-    policy_cache: dict = {}
+    iam = get_client(session, "iam")
+    policy_cache = _AccountPolicyCache({} if aws_policy_cache is None else aws_policy_cache)
 
     try:
         paginator = iam.get_paginator("list_roles")
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig=_PAGE_CONFIG):
             for role in page["Roles"]:
                 matched_rows = scan_role_for_action(
                     session, role["RoleName"], search_pattern, policy_cache
@@ -215,59 +550,52 @@ def _find_action_in_account(account: dict, search_pattern: str, role_name: str)
 
 def find_action_all_accounts(search_pattern: str, role_name: str,
                              account_id: str | None = None,
-                             progress_callback=None) -> list[dict]:
+                             progress_callback=None,
+                             max_workers: int = _MAX_WORKERS,
+                             resolve_name: bool = False) -> list[dict]:
     """Search org accounts for roles with policies matching the IAM action pattern.
 
     Args:
         search_pattern: IAM action pattern (e.g. 's3:CreateBucket', 's3:*').
         role_name: IAM role name to assume in each account.
         account_id: Optional single account ID to scope the search to.
-        progress_callback: Optional callable(account_name, idx, total).
+        progress_callback: Optional callable(account_name, idx, total); total is None
+                           while the org's accounts are still being listed. Called at most
+                           every 0.25 s, plus for the first and last account.
+        max_workers: Number of accounts searched concurrently.
+        resolve_name: With account_id, look up the account's name via Organizations.
 
     Returns list of result dicts (only those with matches).
     """
-    if account_id:
-        account_name = account_id
-        try:
-            org = boto3.client("organizations")
-            desc = org.describe_account(AccountId=account_id)
-            account_name = desc["Account"]["Name"]
-        except Exception:
-            pass
-        accounts = [{"Id": account_id, "Name": account_name}]
-    else:
-        accounts = list_active_accounts()
-    total = len(accounts)
-
-    if not accounts:
-        print("[warn] No active accounts found in the organization.", file=sys.stderr)
-        return []
+    accounts = _target_accounts(account_id, resolve_name)
+    if progress_callback:
+        progress_callback = _throttle_progress(progress_callback)
 
     results = []
+    aws_policy_cache: dict = {}
 
-    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool:
-        future_to_acct = {
-            pool.submit(_find_action_in_account, acct, search_pattern, role_name): acct
-            for acct in accounts
-        }
+    idx = 0
+    completed = _run_accounts(_find_action_in_account, accounts, max_workers, search_pattern, role_name,
+                              aws_policy_cache)
+    for idx, (acct, future, total) in enumerate(completed, 1):
+        if progress_callback:
+            progress_callback(acct["Name"], idx, total)
 
-        for idx, future in enumerate(as_completed(future_to_acct), 1):
-            acct = future_to_acct[future]
-            if progress_callback:
-                progress_callback(acct["Name"], idx, total)
-
-            try:
-                result = future.result()
-            except Exception as exc:
-                result = {
-                    "AccountId": acct["Id"],
-                    "AccountName": acct["Name"],
-                    "matches": [],
-                    "error": str(exc),
-                }
-
-            if result["matches"]:
-                results.append(result)
+        try:
+            result = future.result()
+        except Exception as exc:
+            result = {
+                "AccountId": acct["Id"],
+                "AccountName": acct["Name"],
+                "matches": [],
+                "error": str(exc),
+            }
+
+        if result["matches"]:
+            results.append(result)
+
+    if not idx:
+        print("[warn] No active accounts found in the organization.", file=sys.stderr)
 
     results.sort(key=lambda r: r["AccountName"])
     return results
@@ -2,11 +2,13 @@ import re
 import sys
 from datetime import datetime
 
+_ARN_RE = re.compile(r"^arn:aws:iam::(\d{12}):(role|policy)/(.+)$")
+_SLASH_TBL = str.maketrans({"/": "_"})
+
 
 def parse_arn(arn: str) -> dict:
     """Parse an IAM ARN and extract account, type (role/policy), and name."""
-    pattern = r"^arn:aws:iam::(\d{12}):(role|policy)/(.+)$"
-    match = re.match(pattern, arn)
+    match = _ARN_RE.match(arn)
     if not match:
         print(f"[error] Invalid IAM ARN format: {arn}", file=sys.stderr)
         print("  Expected: arn:aws:iam::<12-digit-account>:role/<name> or arn:aws:iam::<12-digit-account>:policy/<name>", file=sys.stderr)
@@ -18,16 +20,21 @@ def parse_arn(arn: str) -> dict:
     }
 
 
-def generate_filename(entity_type: str, account: str, name: str) -> str:
-    """Generate CSV filename: iam-{role|policy}_{account}_{name}_YYYYMMDDHHMMSS.csv"""
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    safe_name = name.replace("/", "_")
+def generate_filename(entity_type: str, account: str, name: str, *, timestamp: str | None = None) -> str:
+    """Generate CSV filename: iam-{entity_type}_{account}_{name}_YYYYMMDDHHMMSS.csv
+
+    Pass timestamp to give a batch of files the same suffix; defaults to now.
+    """
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    safe_name = name.translate(_SLASH_TBL)
     return f"iam-{entity_type}_{account}_{safe_name}_{timestamp}.csv"
 
 
 def validate_account(account: str) -> str:
     """Validate AWS account ID is 12 digits."""
-    if not re.match(r"^\d{12}$", account):
+    # ASCII-only: str.isdigit() alone would also accept other Unicode digits
+    if not (len(account) == 12 and account.isascii() and account.isdigit()):
         print(f"[error] Account ID must be exactly 12 digits, got: {account}", file=sys.stderr)
         sys.exit(1)
     return account
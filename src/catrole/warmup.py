@@ -0,0 +1,28 @@
+import boto3
+
+# Clients built by the scan/search modes; building one loads its botocore service model
+_SERVICES = ("sts", "iam", "organizations", "sso-admin", "identitystore")
+
+
+def warmup() -> list[str]:
+    """Import catrole's modules and build each AWS client once, then discard them.
+
+    Loading the botocore service models and rich from disk primes the OS page
+    cache, so the next catrole invocations start faster. No AWS API calls are
+    made and no credentials are needed. Returns the service names loaded.
+    """
+    import catrole.formatter  # noqa: F401 — pulls in rich
+    import catrole.idc_scanner  # noqa: F401
+    import catrole.scanner  # noqa: F401
+    import catrole.search  # noqa: F401
+
+    # Static dummy credentials: building a client must not run the user's
+    # credential provider chain (credential_process, SSO, IMDS, ...)
+    session = boto3.Session(
+        aws_access_key_id="warmup",
+        aws_secret_access_key="warmup",
+        region_name="us-east-1",
+    )
+    for service in _SERVICES:
+        session.client(service)
+    return list(_SERVICES)